@@ -16,15 +16,33 @@ Features:
 Recommended: Record WAV files for best compatibility.
 """
 
+import heapq
 import json
+import os
+import shutil
 import sys
 import time
+import wave
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional, List
 
-from PyQt6.QtCore import Qt, QTimer, QUrl, QSize, pyqtSignal, QObject
+from PyQt6.QtCore import (
+    Qt,
+    QBuffer,
+    QByteArray,
+    QElapsedTimer,
+    QIODevice,
+    QMetaObject,
+    QThread,
+    QTimer,
+    QUrl,
+    QSize,
+    pyqtSignal,
+    pyqtSlot,
+    QObject,
+)
 from PyQt6.QtGui import QFont, QAction
 from PyQt6.QtWidgets import (
     QApplication,
@@ -46,7 +64,9 @@ from PyQt6.QtWidgets import (
 
 from PyQt6.QtMultimedia import (
     QSoundEffect,
+    QAudioFormat,
     QAudioInput,
+    QAudioSink,
     QMediaRecorder,
     QMediaCaptureSession,
     QMediaFormat,
@@ -56,6 +76,10 @@ from PyQt6.QtMultimedia import (
 APP_NAME = "Live Drawing Timer + Announcer"
 SOUNDBANK_EXT = "soundbank"
 
+# Audio containers that are already compressed; deflating them again burns
+# CPU for ~1% size reduction, so they go into the zip stored as-is.
+COMPRESSED_AUDIO_EXTS = {".mp3", ".m4a", ".aac", ".ogg", ".opus", ".flac"}
+
 CUES = [
     ("session_start", "Session Start"),
     ("pose_start", "Pose Start"),
@@ -68,7 +92,27 @@ CUES = [
 
 # -------------------- Utilities --------------------
 
-def seconds_to_hhmmss(total: int) -> str:
+# orjson serializes the soundbank manifest a few times faster than the
+# stdlib; fall back to json when it is not installed.
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+
+except ImportError:
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+
+def _format_hhmmss(total: int) -> str:
     if total < 0:
         total = 0
     h = total // 3600
@@ -79,7 +123,16 @@ def seconds_to_hhmmss(total: int) -> str:
     return f"{m:02d}:{s:02d}"
 
 
-@dataclass
+# Every value up to an hour precomputed (~100KB) so the display path is a
+# plain dict lookup; standard pose lengths never leave the table.
+_HHMMSS = {i: _format_hhmmss(i) for i in range(3601)}
+
+
+def seconds_to_hhmmss(total: int) -> str:
+    return _HHMMSS.get(total) or _format_hhmmss(total)
+
+
+@dataclass(slots=True)
 class Pose:
     seconds: int
 
@@ -96,53 +149,168 @@ class SoundBank(QObject):
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
         self.cue_files: Dict[str, Optional[Path]] = {k: None for k, _ in CUES}
+        # WAV cues are decoded once into (QAudioSink, QBuffer) pairs so
+        # play() is a seek+start with no decode step; QSoundEffect stays
+        # as the fallback for other formats.
+        self._pcm: Dict[str, tuple] = {}
         self._effects: Dict[str, QSoundEffect] = {}
+        # Existence checked once per assignment, not per cue fire; keeps
+        # the stat syscall out of the audio-critical play() path.
+        self._exists: Dict[str, bool] = {k: False for k, _ in CUES}
 
-        for cue_key, _ in CUES:
+    def _ensure_effect(self, cue_key: str) -> QSoundEffect:
+        # Each QSoundEffect allocates a native audio pipeline, so they are
+        # created on first assignment rather than six at app launch.
+        eff = self._effects.get(cue_key)
+        if eff is None:
             eff = QSoundEffect()
             eff.setLoopCount(1)
             eff.setVolume(0.9)
             self._effects[cue_key] = eff
+        return eff
 
     def set_cue_file(self, cue_key: str, path: Optional[Path]) -> None:
         self.cue_files[cue_key] = path
-        eff = self._effects.get(cue_key)
-        if eff:
-            if path and path.exists():
-                eff.setSource(QUrl.fromLocalFile(str(path)))
-            else:
+        self._drop_pcm(cue_key)
+        self._exists[cue_key] = bool(path and path.exists())
+        if self._exists[cue_key]:
+            if path.suffix.lower() == ".wav" and self._load_pcm(cue_key, path):
+                eff = self._effects.get(cue_key)
+                if eff:
+                    eff.setSource(QUrl())
+                return
+            eff = self._ensure_effect(cue_key)
+            eff.setSource(QUrl.fromLocalFile(str(path)))
+            eff.statusChanged.connect(lambda k=cue_key: self._prime(k))
+        else:
+            eff = self._effects.get(cue_key)
+            if eff:
                 eff.setSource(QUrl())
 
+    def _load_pcm(self, cue_key: str, path: Path) -> bool:
+        try:
+            with wave.open(str(path), "rb") as wf:
+                frames = wf.readframes(wf.getnframes())
+                rate = wf.getframerate()
+                channels = wf.getnchannels()
+                width = wf.getsampwidth()
+        except (wave.Error, OSError, EOFError):
+            return False
+
+        sample_format = {
+            1: QAudioFormat.SampleFormat.UInt8,
+            2: QAudioFormat.SampleFormat.Int16,
+            4: QAudioFormat.SampleFormat.Int32,
+        }.get(width)
+        if sample_format is None:
+            return False
+
+        fmt = QAudioFormat()
+        fmt.setSampleRate(rate)
+        fmt.setChannelCount(channels)
+        fmt.setSampleFormat(sample_format)
+
+        buf = QBuffer()
+        buf.setData(QByteArray(frames))
+        buf.open(QIODevice.OpenModeFlag.ReadOnly)
+
+        sink = QAudioSink(fmt)
+        sink.setVolume(0.9)
+
+        self._pcm[cue_key] = (sink, buf)
+        return True
+
+    def _drop_pcm(self, cue_key: str) -> None:
+        entry = self._pcm.pop(cue_key, None)
+        if entry:
+            sink, buf = entry
+            sink.stop()
+            buf.close()
+
+    def _prime(self, cue_key: str) -> None:
+        # QSoundEffect decodes asynchronously after setSource; the first real
+        # play() can miss its instant by 50-200ms while the WAV is buffered.
+        # Once the effect reports Ready, push it through the sink silently so
+        # later play() calls start immediately.
+        eff = self._effects.get(cue_key)
+        if not eff or eff.status() != QSoundEffect.Status.Ready:
+            return
+        try:
+            eff.statusChanged.disconnect()
+        except TypeError:
+            pass
+        volume = eff.volume()
+        eff.setVolume(0.0)
+        eff.play()
+        eff.stop()
+        eff.setVolume(volume)
+
     def get_cue_file(self, cue_key: str) -> Optional[Path]:
         return self.cue_files.get(cue_key)
 
     def play(self, cue_key: str) -> None:
+        entry = self._pcm.get(cue_key)
+        if entry:
+            sink, buf = entry
+            sink.stop()
+            buf.seek(0)
+            sink.start(buf)
+            return
         eff = self._effects.get(cue_key)
-        p = self.cue_files.get(cue_key)
-        if eff and p and p.exists():
+        if eff and self._exists.get(cue_key):
             eff.stop()
             eff.play()
 
     def export_soundbank(self, out_path: Path) -> None:
-        out_path = out_path.with_suffix(f".{SOUNDBANK_EXT}")
+        final = out_path.with_suffix(f".{SOUNDBANK_EXT}")
+        # Write to a sibling temp file and rename into place so a crash
+        # mid-export never leaves a truncated soundbank at the target path.
+        tmp = final.with_suffix(final.suffix + ".tmp")
         manifest = {"version": 1, "cues": {}}
 
-        with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for cue_key, _ in CUES:
-                src = self.cue_files.get(cue_key)
-                if src and src.exists():
-                    arc_name = f"{cue_key}{src.suffix.lower()}"
-                    zf.write(src, arcname=arc_name)
-                    manifest["cues"][cue_key] = arc_name
-                else:
-                    manifest["cues"][cue_key] = None
-
-            zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+        # Resolve every source up front with a single stat() each;
+        # ZipInfo.from_file captures size and mtime, so writing the entry
+        # does not have to stat the file a second time.
+        entries = []
+        for cue_key, _ in CUES:
+            src = self.cue_files.get(cue_key)
+            info = None
+            if src is not None:
+                try:
+                    info = zipfile.ZipInfo.from_file(
+                        src, arcname=f"{cue_key}{src.suffix.lower()}"
+                    )
+                except OSError:
+                    info = None
+            entries.append((cue_key, src, info))
+
+        try:
+            with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for cue_key, src, info in entries:
+                    if info is None:
+                        manifest["cues"][cue_key] = None
+                        continue
+                    info.compress_type = (
+                        zipfile.ZIP_STORED
+                        if src.suffix.lower() in COMPRESSED_AUDIO_EXTS
+                        else zipfile.ZIP_DEFLATED
+                    )
+                    with open(src, "rb") as src_f, zf.open(info, "w") as dst_f:
+                        shutil.copyfileobj(src_f, dst_f, length=1024 * 1024)
+                    manifest["cues"][cue_key] = info.filename
+
+                zf.writestr("manifest.json", _json_dumps(manifest))
+
+            os.replace(tmp, final)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            raise
 
     def import_soundbank(self, in_path: Path) -> None:
         with zipfile.ZipFile(in_path, "r") as zf:
-            manifest = json.loads(zf.read("manifest.json").decode("utf-8"))
+            manifest = _json_loads(zf.read("manifest.json"))
             cues = manifest.get("cues", {})
+            names = set(zf.namelist())
 
             stamp = time.strftime("%Y%m%d_%H%M%S")
             target_dir = self.base_dir / f"soundbank_{stamp}"
@@ -150,20 +318,41 @@ class SoundBank(QObject):
 
             for cue_key, _ in CUES:
                 arc_name = cues.get(cue_key)
-                if arc_name and arc_name in zf.namelist():
+                if arc_name and arc_name in names:
                     dest = target_dir / Path(arc_name).name
                     with zf.open(arc_name, "r") as src_f, open(dest, "wb") as dst_f:
-                        dst_f.write(src_f.read())
+                        shutil.copyfileobj(src_f, dst_f, length=1024 * 1024)
                     self.set_cue_file(cue_key, dest)
 
 
 # -------------------- Recorder --------------------
 
-class RecorderController(QWidget):
-    def __init__(self, soundbank: SoundBank):
-        super().__init__()
-        self.soundbank = soundbank
+class RecorderWorker(QObject):
+    """Owns the QMediaRecorder pipeline on a worker thread.
+
+    QMediaRecorder.stop() can stall for up to a second while the WAV
+    container is finalized; keeping the recorder off the GUI thread keeps
+    the countdown and buttons responsive. All GUI updates happen back on
+    the main thread, driven by the saved/error signals.
+    """
 
+    saved = pyqtSignal(str, Path)
+    error = pyqtSignal(str)
+    input_changed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.capture_session = None
+        self.recorder = None
+        self.audio_input = None
+        self.media_devices = None
+        self._cue_key: Optional[str] = None
+
+    def _ensure_pipeline(self):
+        # Built lazily so the QtMultimedia objects are created on the
+        # worker thread, not on whichever thread constructed the worker.
+        if self.recorder is not None:
+            return
         self.capture_session = QMediaCaptureSession()
         self.recorder = QMediaRecorder()
         self.capture_session.setRecorder(self.recorder)
@@ -175,6 +364,71 @@ class RecorderController(QWidget):
 
         self.recorder.errorOccurred.connect(self._on_error)
 
+        # Watch for hardware changes; a QMediaDevices instance is needed
+        # because the change notification is an instance signal.
+        self.media_devices = QMediaDevices(self)
+        self.media_devices.audioInputsChanged.connect(self._refresh_input)
+
+    def _refresh_input(self):
+        # Hot-swap to the new system default rather than rebuilding the
+        # whole capture pipeline when a microphone is plugged/unplugged.
+        device = QMediaDevices.defaultAudioInput()
+        self.audio_input = QAudioInput(device)
+        self.capture_session.setAudioInput(self.audio_input)
+        self.input_changed.emit(device.description())
+
+    def start(self, cue_key: str, path: str):
+        self._ensure_pipeline()
+        self._cue_key = cue_key
+
+        fmt = QMediaFormat()
+        fmt.setFileFormat(QMediaFormat.FileFormat.Wave)
+        self.recorder.setMediaFormat(fmt)
+
+        self.recorder.setOutputLocation(QUrl.fromLocalFile(path))
+        self.recorder.record()
+
+    @pyqtSlot()
+    def stop(self):
+        if self.recorder is None or self._cue_key is None:
+            return
+        self.recorder.stop()
+
+        cue_key, self._cue_key = self._cue_key, None
+        out_path = Path(self.recorder.outputLocation().toLocalFile())
+        if out_path.exists():
+            self.saved.emit(cue_key, out_path)
+        else:
+            self.error.emit("Recording failed.")
+
+    def _on_error(self, err, err_str):
+        self.error.emit(f"Recorder error: {err_str}")
+
+
+class RecorderController(QWidget):
+    record_requested = pyqtSignal(str, str)
+    stop_requested = pyqtSignal()
+
+    def __init__(self, soundbank: SoundBank):
+        super().__init__()
+        self.soundbank = soundbank
+
+        self.worker = RecorderWorker()
+        self.thread = QThread(self)
+        self.worker.moveToThread(self.thread)
+
+        self.record_requested.connect(
+            self.worker.start, Qt.ConnectionType.QueuedConnection
+        )
+        self.stop_requested.connect(
+            self.worker.stop, Qt.ConnectionType.QueuedConnection
+        )
+        self.worker.saved.connect(self._on_saved)
+        self.worker.error.connect(self._on_worker_error)
+        self.worker.input_changed.connect(self._on_input_changed)
+
+        self.thread.start()
+
         self.cue_combo = QComboBox()
         for cue_key, cue_name in CUES:
             self.cue_combo.addItem(cue_name, cue_key)
@@ -207,38 +461,42 @@ class RecorderController(QWidget):
         cue_key = self.cue_combo.currentData()
         out_path = self.soundbank.base_dir / f"{cue_key}_{int(time.time())}.wav"
 
-        fmt = QMediaFormat()
-        fmt.setFileFormat(QMediaFormat.FileFormat.Wave)
-        self.recorder.setMediaFormat(fmt)
-
-        self.recorder.setOutputLocation(QUrl.fromLocalFile(str(out_path)))
-        self.recorder.record()
+        self.record_requested.emit(cue_key, str(out_path))
 
         self.btn_record.setEnabled(False)
         self.btn_stop.setEnabled(True)
         self.status.setText("Recording...")
 
     def stop_recording(self):
-        self.recorder.stop()
+        self.stop_requested.emit()
         self.btn_record.setEnabled(True)
         self.btn_stop.setEnabled(False)
-
-        cue_key = self.cue_combo.currentData()
-        out_url = self.recorder.outputLocation()
-        out_path = Path(out_url.toLocalFile())
-
-        if out_path.exists():
-            self.soundbank.set_cue_file(cue_key, out_path)
-            self.status.setText(f"Saved: {out_path.name}")
-        else:
-            self.status.setText("Recording failed.")
+        self.status.setText("Saving...")
 
     def play_selected(self):
         cue_key = self.cue_combo.currentData()
         self.soundbank.play(cue_key)
 
-    def _on_error(self, err, err_str):
-        self.status.setText(f"Recorder error: {err_str}")
+    def _on_saved(self, cue_key: str, out_path: Path):
+        self.soundbank.set_cue_file(cue_key, out_path)
+        self.status.setText(f"Saved: {out_path.name}")
+
+    def _on_worker_error(self, message: str):
+        self.status.setText(message)
+
+    def _on_input_changed(self, device_name: str):
+        self.status.setText(f"Input device: {device_name}")
+
+    def shutdown(self):
+        # Finalize any in-progress recording with a blocking round trip to
+        # the worker; a queued emit could still be undelivered when quit()
+        # interrupts the event loop. Only then stop the thread and wait
+        # for it to finish.
+        QMetaObject.invokeMethod(
+            self.worker, "stop", Qt.ConnectionType.BlockingQueuedConnection
+        )
+        self.thread.quit()
+        self.thread.wait()
 
 
 # -------------------- Timer Engine --------------------
@@ -249,19 +507,22 @@ class TimerEngine(QObject):
 
     def __init__(self):
         super().__init__()
-        self.remaining = 0
         self.running = False
-        self._last = 0
+        self._elapsed = QElapsedTimer()
+        self._deadline_ms = 0
+        self._last_emit = -1
         self.timer = QTimer()
-        self.timer.setInterval(200)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(100)
         self.timer.timeout.connect(self._tick)
 
     def start(self, seconds: int):
-        self.remaining = seconds
         self.running = True
-        self._last = time.monotonic()
+        self._deadline_ms = seconds * 1000
+        self._elapsed.start()
+        self._last_emit = seconds
         self.timer.start()
-        self.tick_signal.emit(self.remaining)
+        self.tick_signal.emit(seconds)
 
     def stop(self):
         self.running = False
@@ -270,14 +531,12 @@ class TimerEngine(QObject):
     def _tick(self):
         if not self.running:
             return
-        now = time.monotonic()
-        dt = int(now - self._last)
-        if dt <= 0:
-            return
-        self._last = now
-        self.remaining -= dt
-        self.tick_signal.emit(self.remaining)
-        if self.remaining <= 0:
+        remaining = self._deadline_ms - self._elapsed.elapsed()
+        whole = 0 if remaining <= 0 else (remaining + 500) // 1000
+        if whole != self._last_emit:
+            self._last_emit = whole
+            self.tick_signal.emit(whole)
+        if remaining <= 0:
             self.running = False
             self.timer.stop()
             self.finished_signal.emit()
@@ -300,6 +559,12 @@ class TimerWindow(QMainWindow):
 
         self.poses: List[Pose] = []
         self.current_index = -1
+        self._cue_queue: List[tuple] = []  # heap of (monotonic deadline, cue key)
+        self._cue_timer = QTimer(self)
+        self._cue_timer.setSingleShot(True)
+        self._cue_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._cue_timer.timeout.connect(self._fire_cue)
+        self._last_display = ""
 
         # Display
         self.display = QLabel("00:00")
@@ -388,6 +653,16 @@ class TimerWindow(QMainWindow):
         self.poses.append(Pose(total))
         self.pose_list.addItem(seconds_to_hhmmss(total))
 
+    def add_poses_bulk(self, secs_list: List[int]):
+        # Append many poses with a single addItems call so Qt runs one
+        # layout pass instead of one per pose.
+        self.pose_list.setUpdatesEnabled(False)
+        try:
+            self.poses.extend(Pose(s) for s in secs_list)
+            self.pose_list.addItems([seconds_to_hhmmss(s) for s in secs_list])
+        finally:
+            self.pose_list.setUpdatesEnabled(True)
+
     def start_session(self):
         if not self.poses:
             return
@@ -400,6 +675,36 @@ class TimerWindow(QMainWindow):
         self.pose_info.setText(f"Pose {self.current_index + 1}")
         self.soundbank.play("pose_start")
         self.engine.start(pose.seconds)
+        self._schedule_cues(pose.seconds)
+
+    def _schedule_cues(self, seconds: int):
+        # Push each cue's absolute deadline onto a heap and rearm one shared
+        # single-shot timer to the nearest event, instead of allocating a
+        # QTimer per cue per pose.
+        self._cancel_cues()
+        now = time.monotonic()
+        for mark, cue_key in ((300, "five_min"), (60, "one_min"), (30, "thirty_sec")):
+            delay = seconds - mark
+            if delay <= 0:
+                continue
+            heapq.heappush(self._cue_queue, (now + delay, cue_key))
+        self._arm_next()
+
+    def _fire_cue(self):
+        now = time.monotonic()
+        while self._cue_queue and self._cue_queue[0][0] <= now:
+            _, cue_key = heapq.heappop(self._cue_queue)
+            self.soundbank.play(cue_key)
+        self._arm_next()
+
+    def _arm_next(self):
+        if self._cue_queue:
+            delay_ms = max(0, int((self._cue_queue[0][0] - time.monotonic()) * 1000))
+            self._cue_timer.start(delay_ms)
+
+    def _cancel_cues(self):
+        self._cue_queue.clear()
+        self._cue_timer.stop()
 
     def next_pose(self):
         if self.current_index < len(self.poses) - 1:
@@ -418,7 +723,10 @@ class TimerWindow(QMainWindow):
             self.pose_info.setText("Pose Finished (Manual Advance)")
 
     def update_display(self, secs: int):
-        self.display.setText(seconds_to_hhmmss(secs))
+        text = seconds_to_hhmmss(secs)
+        if text != self._last_display:
+            self._last_display = text
+            self.display.setText(text)
 
     # -------- Soundbank --------
 
@@ -444,6 +752,10 @@ class TimerWindow(QMainWindow):
             return
         self.soundbank.import_soundbank(Path(fp))
 
+    def closeEvent(self, event):
+        self.recorder.shutdown()
+        super().closeEvent(event)
+
 
 # -------------------- Main --------------------
 